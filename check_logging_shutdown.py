@@ -0,0 +1,80 @@
+import os
+import sys
+import subprocess
+
+# Seconds a child process may take to exit; shutdown_logging itself waits up to 5
+EXIT_TIMEOUT = 30
+
+# The console stream blocks forever on write, then the interpreter exits normally,
+# so logging.shutdown runs while the writer thread still holds the handler lock
+STUCK_HANDLER_STREAM = """
+import threading
+import time
+import instagram_cancellation as ic
+
+class StuckStream:
+    def write(self, text):
+        threading.Event().wait()
+    def flush(self):
+        pass
+
+ic.setup_logging()
+ic._log_listener.handlers[0].setStream(StuckStream())
+ic.logger.info("this write never returns")
+time.sleep(0.5)
+sys.exit(0 if not ic.shutdown_logging() else 3)
+"""
+
+# stdout is a pipe nobody reads, as when the log collector stops reading; the child
+# ends the same way main() does
+STUCK_STDOUT = """
+import os
+import instagram_cancellation as ic
+
+ic.setup_logging()
+for i in range(5000):
+    ic.logger.info("filling the pipe " + "x" * 100)
+if ic.shutdown_logging():
+    sys.exit(3)
+sys.stderr.flush()
+os._exit(0)
+"""
+
+
+def run_child(name, code, stdout):
+    """
+    Run `code` in a new interpreter and check that it exits in time with status 0.
+
+    Returns:
+        bool: True if the check passed
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen([sys.executable, "-c", "import sys\n" + code], cwd=here, stdout=stdout)
+    try:
+        returncode = process.wait(timeout=EXIT_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        print(f"FAIL {name}: process did not exit within {EXIT_TIMEOUT}s")
+        return False
+
+    if returncode == 3:
+        print(f"FAIL {name}: the writer was not stuck, so nothing was checked")
+        return False
+    if returncode != 0:
+        print(f"FAIL {name}: process exited with status {returncode}")
+        return False
+    print(f"ok   {name}")
+    return True
+
+
+def main():
+    results = [
+        run_child("stuck console stream", STUCK_HANDLER_STREAM, subprocess.DEVNULL),
+        run_child("unread stdout pipe", STUCK_STDOUT, subprocess.PIPE)
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,15 @@ import json
 import random
 import argparse
 import os
+import sys
+import queue
+import signal
+import threading
+import logging
+import logging.handlers
+import itertools
+import statistics
+from collections import deque
 from pathlib import Path
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -12,10 +21,431 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from urllib3.exceptions import ReadTimeoutError
 from webdriver_manager.chrome import ChromeDriverManager
 
+
+logger = logging.getLogger("instagram_cancellation")
+
+# Snapshots of the live pending list taken before and after a run
+LIVE_BEFORE_FILE = "/app/data/live_pending_before.txt"
+LIVE_AFTER_FILE = "/app/data/live_pending_after.txt"
+
+# Single words on the follow requests page that look like usernames but aren't
+PENDING_LIST_LABELS = {"help", "settings", "about", "privacy", "terms", "more", "instagram", "english", "meta"}
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StatusLineHandler(logging.StreamHandler):
+    """
+    Console handler that keeps the progress status on a single line.
+    
+    Records logged with extra={"status": True} overwrite the previous status
+    line when writing to a terminal; other records are printed above it.
+    Without a terminal (e.g. docker logs) the status is a normal line.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self.is_tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.status = None
+        self.abandoned = False
+
+    def abandon(self):
+        """
+        Stop using this handler because its writer thread is stuck on the stream.
+
+        The stuck thread holds the handler lock, so logging.shutdown at exit
+        would wait on it forever; after this call the lock, flush and close
+        are skipped and the stream is never touched again.
+        """
+        self.abandoned = True
+
+    def acquire(self):
+        if not self.abandoned:
+            super().acquire()
+
+    def release(self):
+        if not self.abandoned:
+            super().release()
+
+    def flush(self):
+        if not self.abandoned:
+            super().flush()
+
+    def emit(self, record):
+        try:
+            if getattr(record, "status", False):
+                self.status = record.getMessage()
+                if self.is_tty:
+                    self.stream.write("\r\033[K" + self.status)
+                else:
+                    self.stream.write(self.status + "\n")
+            else:
+                message = self.format(record)
+                if self.is_tty and self.status:
+                    # Clear the status, print the record, then redraw the status below it
+                    self.stream.write("\r\033[K" + message + "\n" + self.status)
+                else:
+                    self.stream.write(message + "\n")
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        # Finish the status line so later output starts on a fresh line
+        if self.is_tty and self.status and not self.abandoned:
+            self.stream.write("\n")
+            self.flush()
+        self.status = None
+        super().close()
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener whose shutdown cannot block on a stuck writer.
+    
+    The stock stop() enqueues its sentinel with put_nowait, which raises
+    queue.Full exactly when the log output is slow, and then joins the
+    writer thread without a timeout.
+    """
+
+    def __init__(self, log_queue, *handlers, stop_timeout=5):
+        super().__init__(log_queue, *handlers)
+        self.stop_timeout = stop_timeout
+        self.dropped = 0
+
+    def enqueue_sentinel(self):
+        try:
+            self.queue.put(self._sentinel, timeout=self.stop_timeout)
+        except queue.Full:
+            # The writer is stuck: drop what it hasn't written yet so the sentinel fits
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.queue.task_done()
+                self.dropped += 1
+            self.queue.put_nowait(self._sentinel)
+
+    def stop(self):
+        """
+        Stop the writer thread, waiting at most `stop_timeout` seconds for it.
+        
+        Returns:
+            bool: True if the writer finished, False if it was left behind (it is a daemon thread)
+        """
+        self.enqueue_sentinel()
+        self._thread.join(self.stop_timeout)
+        finished = not self._thread.is_alive()
+        self._thread = None
+        return finished
+
+
+_log_listener = None
+
+
+def setup_logging(verbose=False, queue_size=10000):
+    """
+    Send log records through a bounded queue to a background writer thread.
+    
+    A slow log sink then only delays the writer thread; when the queue is
+    full, records are dropped rather than blocking the browser loop.
+    
+    Args:
+        verbose (bool): Show per-step debug lines
+        queue_size (int): Maximum number of records waiting to be written
+    """
+    global _log_listener
+    
+    log_queue = queue.Queue(maxsize=queue_size)
+    console = StatusLineHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(message)s", "%H:%M:%S"))
+    
+    logger.handlers = [DroppingQueueHandler(log_queue)]
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    logger.propagate = False
+    
+    _log_listener = BoundedQueueListener(log_queue, console)
+    _log_listener.start()
+
+
+def flush_logging(timeout=5):
+    """
+    Wait until every queued log record has been written, or until `timeout` seconds have passed.
+    
+    Returns:
+        bool: True if the queue was fully written
+    """
+    if not _log_listener:
+        return True
+    deadline = time.monotonic() + timeout
+    while _log_listener.queue.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def shutdown_logging():
+    """
+    Write the remaining log records (within a bounded time) and stop the writer thread.
+    
+    Returns:
+        bool: False if the writer thread is stuck on the log output and was left behind
+    """
+    global _log_listener
+    
+    if not _log_listener:
+        return True
+    
+    listener = _log_listener
+    _log_listener = None
+    finished = listener.stop()
+    for handler in listener.handlers:
+        if finished:
+            # Only touch the output once the writer is done with it
+            handler.close()
+        elif hasattr(handler, "abandon"):
+            handler.abandon()
+    dropped = listener.dropped + sum(getattr(handler, "dropped", 0) for handler in logger.handlers)
+    if dropped:
+        print(f"{dropped} log lines were dropped because the log output could not keep up.", file=sys.stderr)
+    return finished
+
+
+def atomic_write(path, text):
+    """
+    Write a file so that readers see either the old or the new content, never a partial one.
+    
+    The data is written to a temporary file, fsynced and renamed over the target.
+    
+    Args:
+        path (str): Destination file
+        text (str): New file content
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    
+    # Make the rename itself durable
+    dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class ProgressTracker:
+    def __init__(self, total, window=20):
+        """
+        Track completed usernames and estimate throughput and time remaining.
+        
+        Args:
+            total (int): Number of usernames in the run, or None while it is still unknown
+            window (int): Number of recent usernames used for the moving-average rate
+        """
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.completions = deque([time.monotonic()], maxlen=window + 1)
+
+    def update(self, success):
+        """Record one processed username."""
+        if success:
+            self.done += 1
+        else:
+            self.failed += 1
+        self.completions.append(time.monotonic())
+
+    def rate_per_minute(self):
+        """Usernames per minute over the recent window, batch breaks included."""
+        elapsed = self.completions[-1] - self.completions[0]
+        if elapsed <= 0:
+            return 0.0
+        return (len(self.completions) - 1) / elapsed * 60
+
+    def status_line(self):
+        """Compact one-line summary of the run."""
+        rate = self.rate_per_minute()
+        if self.total is None:
+            # Usernames are still being streamed in, so there is no end to estimate
+            return (f"[{self.done + self.failed}/?] done {self.done} failed {self.failed} "
+                    f"| {rate:.1f}/min")
+        remaining = self.total - self.done - self.failed
+        if rate > 0:
+            eta = int(remaining / rate * 60)
+            eta_text = f"{eta // 3600}:{eta % 3600 // 60:02d}:{eta % 60:02d}"
+        else:
+            eta_text = "--:--:--"
+        return (f"[{self.done + self.failed}/{self.total}] done {self.done} failed {self.failed} "
+                f"remaining {remaining} | {rate:.1f}/min | ETA {eta_text}")
+
+
+class PendingListUnavailableError(Exception):
+    """Raised when the current follow requests page could not be read."""
+    pass
+
+
+class ProfileTimeoutError(Exception):
+    """Raised when a single username runs past its time budget."""
+    pass
+
+
+class PageLoadTimeoutError(ProfileTimeoutError):
+    """Raised when a single page load runs past the page-load timeout, within the budget."""
+    pass
+
+
+class NetworkUsageTracker:
+    def __init__(self, slowest_count=5):
+        """
+        Aggregate network events from Chrome's performance log per username and phase.
+        
+        Args:
+            slowest_count (int): Number of slowest resources to keep per username
+        """
+        self.slowest_count = slowest_count
+        self.totals = {"usernames": 0, "requests": 0, "bytes": 0, "cache_hits": 0}
+        self.phase_totals = {}
+        self.start_item()
+
+    def start_item(self):
+        """Reset the counters for a new username."""
+        self.item_phases = {}
+        self.in_flight = {}
+        self.cached = set()
+        self.finished = []
+
+    def _phase_stats(self, phase):
+        return self.item_phases.setdefault(phase, {"requests": 0, "bytes": 0, "cache_hits": 0})
+
+    def _mark_cached(self, request_id):
+        request = self.in_flight.get(request_id)
+        if request and request_id not in self.cached:
+            self.cached.add(request_id)
+            self._phase_stats(request["phase"])["cache_hits"] += 1
+
+    def collect(self, entries, phase):
+        """
+        Attribute performance log entries to a phase.
+        
+        Requests are counted in the phase they started in, even if they
+        finish during a later one.
+        
+        Args:
+            entries (list): Entries returned by driver.get_log("performance")
+            phase (str): Name of the phase that just ended
+        """
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            
+            method = message.get("method")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+            
+            if method == "Network.requestWillBeSent":
+                # Redirects reuse the request id; keep the original start
+                if request_id in self.in_flight:
+                    continue
+                self.in_flight[request_id] = {
+                    "url": params.get("request", {}).get("url", "").split("?")[0],
+                    "start": params.get("timestamp", 0),
+                    "phase": phase
+                }
+                self._phase_stats(phase)["requests"] += 1
+            elif method == "Network.requestServedFromCache":
+                self._mark_cached(request_id)
+            elif method == "Network.responseReceived":
+                response = params.get("response", {})
+                if response.get("fromDiskCache") or response.get("fromServiceWorker") or response.get("fromPrefetchCache"):
+                    self._mark_cached(request_id)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                request = self.in_flight.pop(request_id, None)
+                if request is None:
+                    continue
+                # loadingFailed carries no size
+                self._phase_stats(request["phase"])["bytes"] += int(params.get("encodedDataLength", 0))
+                self.finished.append({
+                    "url": request["url"],
+                    "phase": request["phase"],
+                    "seconds": round(params.get("timestamp", request["start"]) - request["start"], 3)
+                })
+
+    def finish_item(self):
+        """
+        Close the current username and add it to the run totals.
+        
+        Returns:
+            dict: Request count, transferred bytes and cache hits per phase and in total,
+                  plus the slowest resources
+        """
+        record = {
+            "requests": sum(stats["requests"] for stats in self.item_phases.values()),
+            "bytes": sum(stats["bytes"] for stats in self.item_phases.values()),
+            "cache_hits": sum(stats["cache_hits"] for stats in self.item_phases.values()),
+            "unfinished": len(self.in_flight),
+            "phases": self.item_phases,
+            "slowest": sorted(self.finished, key=lambda request: request["seconds"], reverse=True)[:self.slowest_count]
+        }
+        
+        self.totals["usernames"] += 1
+        for key in ("requests", "bytes", "cache_hits"):
+            self.totals[key] += record[key]
+        for phase, stats in self.item_phases.items():
+            phase_total = self.phase_totals.setdefault(phase, {"requests": 0, "bytes": 0, "cache_hits": 0})
+            for key, value in stats.items():
+                phase_total[key] += value
+        
+        self.start_item()
+        return record
+
+    def summary_lines(self):
+        """
+        Describe the network usage of the whole run.
+        
+        Returns:
+            list: Human-readable summary lines
+        """
+        count = self.totals["usernames"]
+        if not count:
+            return []
+        
+        lines = [
+            f"Network: {self.totals['requests']} requests, {self.totals['bytes'] / 1024 / 1024:.1f} MB transferred, "
+            f"{self.totals['cache_hits']} cache hits over {count} usernames",
+            f"Per username: {self.totals['requests'] / count:.1f} requests, {self.totals['bytes'] / 1024 / count:.0f} KB"
+        ]
+        for phase, stats in sorted(self.phase_totals.items(), key=lambda item: item[1]["bytes"], reverse=True):
+            lines.append(f"  {phase}: {stats['requests']} requests, {stats['bytes'] / 1024:.0f} KB, {stats['cache_hits']} cache hits")
+        return lines
+
+
 class InstagramCancellationTool:
-    def __init__(self, headless=True, delay_min=2, delay_max=4):
+    def __init__(self, headless=True, delay_min=2, delay_max=4, profile_timeout=45, page_load_timeout=30,
+                 batch_break_min=20, batch_break_max=30, trace_file=None,
+                 spa_navigation=False, spa_settle_timeout=5, network_log_file=None):
         """
         Initialize the Instagram cancellation tool.
         
@@ -23,9 +453,51 @@ class InstagramCancellationTool:
             headless (bool): Run browser in headless mode (without UI)
             delay_min (int): Minimum delay between requests in seconds
             delay_max (int): Maximum delay between requests in seconds
+            profile_timeout (int): Maximum time in seconds spent on a single username
+            page_load_timeout (int): Maximum time in seconds for a single page load
+            batch_break_min (int): Minimum break between batches in seconds
+            batch_break_max (int): Maximum break between batches in seconds
+            trace_file (str): Optional JSONL file to record per-phase timings of each username
+            spa_navigation (bool): Move between profiles with the app's client-side routing
+            spa_settle_timeout (int): Seconds to wait for an in-app navigation before reloading the page
+            network_log_file (str): Optional JSONL file for per-username network usage; enables network accounting
         """
         self.delay_min = delay_min
         self.delay_max = delay_max
+        self.profile_timeout = profile_timeout
+        self.page_load_timeout = page_load_timeout
+        self.batch_break_min = batch_break_min
+        self.batch_break_max = batch_break_max
+        self.trace_file = trace_file
+        self.spa_navigation = spa_navigation
+        self.spa_settle_timeout = spa_settle_timeout
+        
+        # Time from starting navigation to finding the Requested button, per navigation mode.
+        # "fallback" is a full page load after in-app navigation did not settle; the wasted
+        # in-app wait is not included
+        self.time_to_button = {"spa": [], "full": [], "fallback": []}
+        self.spa_fallbacks = 0
+        self.last_nav_mode = None
+        
+        # Per-phase timings and outcome of the most recent cancel_follow_request call
+        self.last_phases = {}
+        self.last_outcome = None
+        self._phase_mark = time.monotonic()
+        
+        # Usernames yielded by the most recent read of the live pending list
+        self.live_usernames = []
+        
+        # Set from a signal handler: finish the current username, then stop
+        self.stop_requested = False
+        self.last_progress = None
+        # True while waiting for the user to type something; a signal then interrupts right away
+        self.at_prompt = False
+        # Set once cancel_all_requests starts, so an early exit doesn't overwrite the last run's metrics
+        self.run_started = False
+        
+        # Network accounting from Chrome's performance log (opt-in, it costs a driver call per phase)
+        self.network_log_file = network_log_file
+        self.network = NetworkUsageTracker() if network_log_file else None
         
         # Initialize the webdriver with Docker-compatible settings
         options = webdriver.ChromeOptions()
@@ -48,13 +520,24 @@ class InstagramCancellationTool:
         # Add user agent to make it look like a real browser
         options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
         
+        if self.network:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        
         # For Docker: specify the Chrome binary location if needed
         chrome_binary = "/usr/bin/google-chrome"
         if os.path.exists(chrome_binary):
             options.binary_location = chrome_binary
         
         # Initialize the Chrome driver
+        # Cap every browser command (selenium's default is 120s). It must outlast a page load,
+        # and because it also outlasts the per-username budget, a command that hits it
+        # always leaves that budget exhausted
+        self.command_timeout = max(self.profile_timeout, self.page_load_timeout) + 5
+        RemoteConnection.set_timeout(self.command_timeout)
+        
         self.driver = webdriver.Chrome(options=options)
+        self.driver.set_page_load_timeout(self.page_load_timeout)
         self.wait = WebDriverWait(self.driver, 10)
         
         # Login status
@@ -199,10 +682,10 @@ class InstagramCancellationTool:
             print("Please check this screenshot to see if you need to enter a verification code.")
             
             # Ask the user if 2FA is needed
-            needs_2fa = input("Do you need to enter a 2FA code? (y/n): ").strip().lower()
+            needs_2fa = self.ask("Do you need to enter a 2FA code? (y/n): ").strip().lower()
             
             if needs_2fa == 'y':
-                verification_code = input("Enter the 6-digit verification code from your auth app: ").strip()
+                verification_code = self.ask("Enter the 6-digit verification code from your auth app: ").strip()
                 
                 # Try to find the input field
                 input_found = False
@@ -430,10 +913,374 @@ class InstagramCancellationTool:
             print(f"Error extracting usernames: {str(e)}")
             return []
 
+    def stream_pending_requests(self, batch_size=50, max_idle_rounds=3, snapshot_file=None):
+        """
+        Stream usernames from the account's current follow requests page.
+        
+        The page only renders part of the list at a time, so it is scrolled
+        (and its "View More" button clicked) repeatedly. Usernames are
+        yielded in batches as soon as they appear rather than after the
+        whole list has loaded.
+        
+        Args:
+            batch_size (int): Number of new usernames to collect before yielding
+            max_idle_rounds (int): Stop after this many rounds with no new usernames
+            snapshot_file (str): Optional file that every yielded batch is appended to
+            
+        Yields:
+            list: Batch of usernames not seen in any previous batch
+            
+        Raises:
+            PendingListUnavailableError: If the list never appeared (login redirect,
+                                         challenge page or changed layout)
+        """
+        if not self.logged_in:
+            raise PendingListUnavailableError("not logged in")
+        
+        logger.info("Opening the current follow requests page...")
+        self.driver.get("https://www.instagram.com/accounts/access_tool/current_follow_requests")
+        time.sleep(3)
+        self.driver.save_screenshot("/app/data/current_follow_requests.png")
+        
+        # Everything yielded by this call, in page order
+        self.live_usernames = []
+        snapshot = open(snapshot_file, "w") if snapshot_file else None
+        
+        def emit(batch):
+            self.live_usernames.extend(batch)
+            if snapshot:
+                snapshot.write("".join(f"{username}\n" for username in batch))
+                snapshot.flush()
+            return batch
+        
+        seen = set()
+        pending = []
+        idle_rounds = 0
+        list_found = False
+        
+        try:
+            while idle_rounds < max_idle_rounds:
+                if self.stop_requested:
+                    logger.info("Stop requested, no longer reading the pending requests list.")
+                    break
+                
+                visible = self._extract_visible_pending_usernames()
+                if visible is None:
+                    if "login" in self.driver.current_url or "challenge" in self.driver.current_url:
+                        raise PendingListUnavailableError(f"redirected to {self.driver.current_url}")
+                    if not list_found and idle_rounds + 1 >= max_idle_rounds:
+                        self.driver.save_screenshot("/app/data/current_follow_requests_missing.png")
+                        raise PendingListUnavailableError("the current follow requests list did not load")
+                    visible = []
+                else:
+                    list_found = True
+                
+                new_found = False
+                for username in visible:
+                    if username not in seen:
+                        seen.add(username)
+                        pending.append(username)
+                        new_found = True
+                
+                while len(pending) >= batch_size:
+                    yield emit(pending[:batch_size])
+                    pending = pending[batch_size:]
+                
+                idle_rounds = 0 if new_found else idle_rounds + 1
+                
+                # Ask the page for more entries
+                try:
+                    more_buttons = self.driver.find_elements(By.XPATH, "//button[contains(., 'View More')]")
+                    if more_buttons and more_buttons[0].is_displayed():
+                        more_buttons[0].click()
+                except Exception:
+                    pass
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(random.uniform(1, 2))
+            
+            if pending:
+                yield emit(pending)
+        finally:
+            if snapshot:
+                snapshot.close()
+        
+        logger.info(f"Found {len(seen)} pending follow requests on the live list.")
+
+    def _extract_visible_pending_usernames(self):
+        """
+        Read the usernames currently rendered in the follow requests list.
+        
+        Only the section under the "Current follow requests" heading is
+        scanned, so navigation, footer links and counts are not mistaken
+        for usernames.
+        
+        Returns:
+            list: Usernames in page order, or None if the list is not on the page
+                  (an empty list means the list is there but has no usernames)
+        """
+        try:
+            texts = self.driver.execute_script("""
+                var main = document.querySelector('main') || document.body;
+                var heading = Array.from(main.querySelectorAll('h1, h2, h3')).find(function (el) {
+                    return /current follow requests/i.test(el.textContent);
+                });
+                if (!heading) {
+                    return null;
+                }
+                var root = heading.closest('section, article') || heading.parentElement;
+                var out = [];
+                root.querySelectorAll('div, span').forEach(function (el) {
+                    if (el.children.length === 0 && el.textContent
+                            && !el.closest('h1, h2, h3, button, nav, footer, [role="button"]')) {
+                        out.push(el.textContent.trim());
+                    }
+                });
+                return out;
+            """)
+        except Exception as e:
+            logger.warning(f"Error reading the pending requests list: {str(e)}")
+            return None
+        
+        if texts is None:
+            return None
+        
+        # Instagram usernames: lowercase letters, digits, periods and underscores, up to 30
+        # characters, with at least one letter or underscore (so counts don't match)
+        return [
+            text for text in texts
+            if re.fullmatch(r'[a-z0-9._]{1,30}', text)
+            and re.search(r'[a-z_]', text)
+            and text not in PENDING_LIST_LABELS
+        ]
+
+    def fetch_pending_requests(self, snapshot_file, batch_size=50):
+        """
+        Collect the complete live list of pending follow requests.
+        
+        Each batch is appended to `snapshot_file` as it arrives, so a partial
+        list survives an interrupted scroll.
+        
+        Args:
+            snapshot_file (str): File to save the list to
+            batch_size (int): Number of usernames per streamed batch
+            
+        Returns:
+            list: Usernames currently pending
+        """
+        usernames = []
+        for batch in self.stream_pending_requests(batch_size=batch_size, snapshot_file=snapshot_file):
+            usernames.extend(batch)
+            logger.info(f"Loaded {len(usernames)} pending requests so far...")
+        return usernames
+
+    def stream_pending_usernames_in_tab(self, snapshot_file, batch_size=50):
+        """
+        Yield pending usernames one at a time while the list is still loading.
+        
+        The follow requests page is scrolled in a second tab and a new batch
+        is only read from it when the previous one has been used up, so the
+        first tab can start cancelling right away.
+        
+        Args:
+            snapshot_file (str): File to save the list to as it loads
+            batch_size (int): Number of usernames read from the list tab at a time
+            
+        Yields:
+            str: Username with a pending follow request
+        """
+        work_window = self.driver.current_window_handle
+        self.driver.switch_to.new_window('tab')
+        list_window = self.driver.current_window_handle
+        self.driver.switch_to.window(work_window)
+        
+        batches = self.stream_pending_requests(batch_size=batch_size, snapshot_file=snapshot_file)
+        try:
+            while True:
+                self.driver.switch_to.window(list_window)
+                try:
+                    batch = next(batches)
+                except StopIteration:
+                    return
+                except PendingListUnavailableError as e:
+                    logger.error(f"Could not read the live pending list ({str(e)}); no more usernames to cancel.")
+                    return
+                finally:
+                    self.driver.switch_to.window(work_window)
+                logger.info(f"Loaded {len(self.live_usernames)} pending requests so far...")
+                for username in batch:
+                    yield username
+        finally:
+            batches.close()
+            try:
+                self.driver.switch_to.window(list_window)
+                self.driver.close()
+            except Exception:
+                pass
+            self.driver.switch_to.window(work_window)
+
+    def ask(self, question):
+        """
+        Ask the user for input.
+        
+        Args:
+            question (str): Prompt to show
+            
+        Returns:
+            str: The user's answer
+        """
+        self.at_prompt = True
+        try:
+            return input(question)
+        finally:
+            self.at_prompt = False
+
+    def request_stop(self):
+        """
+        Ask the run to stop after the username in progress.
+        
+        Only sets a flag, so it is safe to call from a signal handler.
+        """
+        self.stop_requested = True
+
+    def _interruptible_sleep(self, seconds):
+        """Sleep for `seconds`, returning early if a stop was requested."""
+        end = time.monotonic() + seconds
+        while not self.stop_requested:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(0.5, remaining))
+
+    def _check_deadline(self, deadline, step):
+        """
+        Abort the current username if its time budget has run out.
+        
+        Args:
+            deadline (float): time.monotonic() value at which the budget expires
+            step (str): Description of the step about to run, used in the error
+            
+        Returns:
+            float: Seconds left in the budget
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ProfileTimeoutError(f"time budget exhausted before {step}")
+        return remaining
+
+    def _sleep_within_deadline(self, seconds, deadline, step):
+        """Sleep for up to `seconds`, but never past the deadline."""
+        remaining = self._check_deadline(deadline, step)
+        time.sleep(min(seconds, remaining))
+        self._check_deadline(deadline, step)
+
+    def _reset_browser_state(self):
+        """
+        Stop any in-flight page load and park the browser on a blank page
+        so that a stuck profile cannot affect the next one.
+        """
+        try:
+            self.driver.execute_script("window.stop();")
+        except Exception:
+            pass
+        try:
+            self.driver.set_page_load_timeout(self.page_load_timeout)
+            self.driver.get("about:blank")
+        except Exception:
+            pass
+
+    def _start_phases(self):
+        """Reset the per-phase timings for a new username."""
+        self.last_phases = {}
+        self.last_outcome = None
+        self.last_nav_mode = None
+        self._phase_mark = time.monotonic()
+        
+        if self.network:
+            # Discard traffic from before this username (login, batch breaks, background polling)
+            self._read_performance_log()
+            self.network.start_item()
+
+    def _end_phase(self, name):
+        """Attribute the time (and network traffic) since the previous phase boundary to `name`."""
+        now = time.monotonic()
+        self.last_phases[name] = round(self.last_phases.get(name, 0) + now - self._phase_mark, 3)
+        self._phase_mark = now
+        
+        if self.network:
+            self.network.collect(self._read_performance_log(), name)
+
+    def _read_performance_log(self):
+        """Drain Chrome's performance log buffer."""
+        try:
+            return self.driver.get_log("performance")
+        except Exception:
+            return []
+
+    def _navigate_in_app(self, username, deadline):
+        """
+        Open a profile through the already-loaded app's client-side routing.
+        
+        This skips the full document load and JavaScript bootstrap that
+        driver.get() causes for every profile.
+        
+        Args:
+            username (str): Instagram username
+            deadline (float): time.monotonic() value at which the budget expires
+            
+        Returns:
+            bool: True if the profile rendered, False if the caller should fall back to driver.get()
+        """
+        # The app has to be loaded already, e.g. not after a reset to about:blank
+        if not self.driver.current_url.startswith("https://www.instagram.com/"):
+            return False
+        
+        remaining = self._check_deadline(deadline, "in-app navigation")
+        try:
+            self.driver.execute_script("""
+                window.history.pushState({}, '', arguments[0]);
+                window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+            """, f"/{username}/")
+            
+            # Settled once the title names the profile and its header buttons have rendered
+            WebDriverWait(self.driver, max(0.5, min(self.spa_settle_timeout, remaining)), poll_frequency=0.1).until(
+                lambda driver: driver.execute_script("""
+                    return document.title.toLowerCase().indexOf('@' + arguments[0].toLowerCase()) !== -1
+                        && !!document.querySelector('header button, header div[role="button"]');
+                """, username)
+            )
+            return True
+        except TimeoutException:
+            logger.debug(f"In-app navigation to {username} did not settle, falling back to a full page load...")
+            return False
+        except Exception as e:
+            logger.debug(f"In-app navigation failed ({str(e)}), falling back to a full page load...")
+            return False
+
+    def report_navigation_stats(self):
+        """Log the time from navigation to finding the Requested button for each navigation mode."""
+        for mode, label in (("spa", "In-app navigation"), ("full", "Full page load"),
+                            ("fallback", "Full page load after in-app fallback")):
+            samples = self.time_to_button[mode]
+            if samples:
+                logger.info(f"{label}: {len(samples)} profiles, time to button "
+                            f"median {statistics.median(samples):.2f}s, mean {statistics.mean(samples):.2f}s")
+        if self.spa_fallbacks:
+            logger.info(f"In-app navigation fell back to a full page load {self.spa_fallbacks} times")
+
     def cancel_follow_request(self, username):
         """
         Cancel a follow request for a specific user.
         
+        The whole attempt (navigation, button lookups and both clicks) must
+        complete within `profile_timeout` seconds. If it does not, the
+        username is abandoned as a transient failure and the browser is reset.
+        
+        The budget is checked between browser commands; page loads are capped
+        to what is left of it. Any other single command (a screenshot, a
+        lookup, a click) can only be cut off by `command_timeout`, so a wedged
+        browser can keep one username for at most
+        `profile_timeout + command_timeout` seconds.
+        
         Args:
             username (str): Instagram username
             
@@ -441,27 +1288,57 @@ class InstagramCancellationTool:
             bool: True if the request was cancelled successfully, False otherwise
         """
         if not self.logged_in:
-            print("You must be logged in to cancel follow requests.")
+            logger.error("You must be logged in to cancel follow requests.")
             return False
         
+        started = time.monotonic()
+        deadline = started + self.profile_timeout
+        self._start_phases()
+        
         try:
             # Navigate to the user's profile
-            print(f"Navigating to {username}'s profile...")
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            
-            # Wait for the page to load
-            time.sleep(random.uniform(2, 3))
+            logger.debug(f"Navigating to {username}'s profile...")
+            nav_start = time.monotonic()
+            if self.spa_navigation and self._navigate_in_app(username, deadline):
+                self.last_nav_mode = "spa"
+                self._end_phase("navigate")
+            else:
+                # Full page load, never letting it outlive the budget
+                if self.spa_navigation:
+                    self.last_nav_mode = "fallback"
+                    self.spa_fallbacks += 1
+                    nav_start = time.monotonic()
+                else:
+                    self.last_nav_mode = "full"
+                remaining = self._check_deadline(deadline, "navigation")
+                self.driver.set_page_load_timeout(max(1, min(self.page_load_timeout, remaining)))
+                try:
+                    self.driver.get(f"https://www.instagram.com/{username}/")
+                except TimeoutException:
+                    if remaining <= self.page_load_timeout:
+                        # The load was capped by what was left of the budget
+                        raise ProfileTimeoutError("time budget exhausted during page load")
+                    raise PageLoadTimeoutError(f"page load took longer than {self.page_load_timeout}s")
+                finally:
+                    self.driver.set_page_load_timeout(self.page_load_timeout)
+                self._end_phase("navigate")
+                
+                # Wait for the page to load
+                self._sleep_within_deadline(random.uniform(2, 3), deadline, "profile render")
             
             # Save a screenshot for debugging
             self.driver.save_screenshot(f"/app/data/profile_{username}.png")
             
             # Check if the profile exists
             if "Page Not Found" in self.driver.title or "Sorry, this page isn't available." in self.driver.page_source:
-                print(f"Profile not found: {username}")
+                logger.warning(f"Profile not found: {username}")
+                self._end_phase("render")
+                self.last_outcome = "not_found"
                 return False
+            self._end_phase("render")
             
             # Look for the "Requested" button using multiple selectors
-            print(f"Looking for Requested button...")
+            logger.debug("Looking for Requested button...")
             requested_button = None
             
             # List of potential selector strategies
@@ -475,6 +1352,7 @@ class InstagramCancellationTool:
             
             # Try each selector
             for selector in selectors:
+                self._check_deadline(deadline, "Requested button lookup")
                 try:
                     buttons = self.driver.find_elements(By.XPATH, selector)
                     for button in buttons:
@@ -483,11 +1361,12 @@ class InstagramCancellationTool:
                             break
                     if requested_button:
                         break
-                except:
+                except Exception:
                     continue
             
             # If we still haven't found it, try a more generic approach
             if not requested_button:
+                self._check_deadline(deadline, "Requested button lookup")
                 try:
                     # Find all buttons on the page
                     all_buttons = self.driver.find_elements(By.TAG_NAME, "button")
@@ -495,26 +1374,34 @@ class InstagramCancellationTool:
                         if 'Requested' in button.text:
                             requested_button = button
                             break
-                except:
+                except Exception:
                     pass
             
+            self._end_phase("find_requested")
+            if requested_button:
+                self.time_to_button[self.last_nav_mode].append(round(time.monotonic() - nav_start, 3))
             if not requested_button:
-                print(f"No Requested button found for {username}")
+                logger.warning(f"No Requested button found for {username}")
+                self.last_outcome = "no_button"
                 return False
             
             # Click the Requested button
-            print(f"Clicking Requested button...")
+            logger.debug("Clicking Requested button...")
+            self._check_deadline(deadline, "Requested button click")
             try:
                 requested_button.click()
-            except:
-                # Try JavaScript click if regular click fails
+            except Exception:
+                # Try JavaScript click if regular click fails, unless the click used up the budget
+                self._check_deadline(deadline, "Requested button click")
                 self.driver.execute_script("arguments[0].click();", requested_button)
+            self._end_phase("click_requested")
             
             # Wait for the confirmation dialog
-            time.sleep(2)
+            self._sleep_within_deadline(2, deadline, "confirmation dialog")
             
             # Save a screenshot of the dialog
             self.driver.save_screenshot(f"/app/data/dialog_{username}.png")
+            self._end_phase("dialog")
             
             # Look for the "Unfollow" button in the dialog
             unfollow_button = None
@@ -526,6 +1413,7 @@ class InstagramCancellationTool:
             ]
             
             for selector in unfollow_selectors:
+                self._check_deadline(deadline, "Unfollow button lookup")
                 try:
                     buttons = self.driver.find_elements(By.XPATH, selector)
                     for button in buttons:
@@ -534,11 +1422,12 @@ class InstagramCancellationTool:
                             break
                     if unfollow_button:
                         break
-                except:
+                except Exception:
                     continue
             
             # If we still haven't found it, try a more generic approach
             if not unfollow_button:
+                self._check_deadline(deadline, "Unfollow button lookup")
                 try:
                     # Find all buttons in the dialog
                     dialog = self.driver.find_element(By.XPATH, "//div[@role='dialog']")
@@ -546,76 +1435,159 @@ class InstagramCancellationTool:
                     # Usually the Unfollow button is the first or second button
                     if buttons and len(buttons) >= 1:
                         unfollow_button = buttons[0]
-                except:
+                except Exception:
                     pass
             
+            self._end_phase("find_unfollow")
             if not unfollow_button:
-                print(f"No Unfollow button found in dialog for {username}")
+                logger.warning(f"No Unfollow button found in dialog for {username}")
+                self.last_outcome = "no_button"
                 return False
             
             # Click the Unfollow button
-            print(f"Clicking Unfollow button...")
+            logger.debug("Clicking Unfollow button...")
+            self._check_deadline(deadline, "Unfollow button click")
             try:
                 unfollow_button.click()
-            except:
-                # Try JavaScript click if regular click fails
+            except Exception:
+                # Try JavaScript click if regular click fails, unless the click used up the budget
+                self._check_deadline(deadline, "Unfollow button click")
                 self.driver.execute_script("arguments[0].click();", unfollow_button)
+            self._end_phase("click_unfollow")
             
-            # Add a random delay to avoid rate limiting
+            # Add a random delay to avoid rate limiting (not counted against the budget)
             delay = random.uniform(self.delay_min, self.delay_max)
-            print(f"Waiting {delay:.1f} seconds before next request...")
-            time.sleep(delay)
+            logger.debug(f"Waiting {delay:.1f} seconds before next request...")
+            self._interruptible_sleep(delay)
+            self._end_phase("pace")
             
-            print(f"Successfully cancelled follow request for {username}")
+            logger.debug(f"Successfully cancelled follow request for {username}")
+            self.last_outcome = "success"
             return True
             
+        except (ProfileTimeoutError, ReadTimeoutError) as e:
+            # ReadTimeoutError: a single browser command ran past command_timeout
+            elapsed = time.monotonic() - started
+            logger.warning(f"Timed out on {username} after {elapsed:.1f}s ({str(e)}). Skipping as a transient failure.")
+            self._reset_browser_state()
+            self._end_phase("error")
+            self.last_outcome = "page_load_timeout" if isinstance(e, PageLoadTimeoutError) else "timeout"
+            return False
         except Exception as e:
-            print(f"Error cancelling follow request for {username}: {str(e)}")
+            logger.warning(f"Error cancelling follow request for {username}: {str(e)}")
+            self._end_phase("error")
+            self.last_outcome = "error"
             return False
 
-    def cancel_all_requests(self, usernames, batch_size=10, continue_from=0):
+    def cancel_all_requests(self, usernames, batch_size=10, continue_from=0, previous_success=0, previous_failed=None):
         """
         Cancel follow requests for multiple users.
         
+        Stops before the next username once request_stop() has been called.
+        
         Args:
-            usernames (list): List of Instagram usernames
+            usernames (list): List of Instagram usernames, or an iterator that yields them as they are found
             batch_size (int): Number of requests to cancel in one batch
             continue_from (int): Index to continue from (for resuming)
+            previous_success (int): Successful cancellations from an earlier run, included in saved progress
+            previous_failed (list): Failed usernames from an earlier run, included in saved progress
             
         Returns:
-            tuple: (success_count, failed_usernames)
+            tuple: (success_count, failed_usernames) for this run only
         """
         if not self.logged_in:
-            print("You must be logged in to cancel follow requests.")
+            logger.error("You must be logged in to cancel follow requests.")
             return 0, usernames
         
-        total = len(usernames)
+        self.run_started = True
+        total = len(usernames) if isinstance(usernames, list) else None
         success_count = 0
         failed_usernames = []
+        previous_failed = previous_failed or []
+        progress = ProgressTracker(total - continue_from if total is not None else None)
+        remaining_usernames = itertools.islice(usernames, continue_from, None)
         
         # Process usernames in batches
-        for i in range(continue_from, total):
-            username = usernames[i]
+        i = continue_from
+        while True:
+            # Check before taking the next username, which may load more of a streamed list
+            if self.stop_requested:
+                left = f" ({total - i} left)" if total is not None else ""
+                logger.info(f"Stop requested, not starting new usernames{left}.")
+                break
+            
+            username = next(remaining_usernames, None)
+            if username is None:
+                break
             
-            print(f"\nProcessing {i+1}/{total}: {username}")
+            logger.debug(f"Processing {i+1}/{total or '?'}: {username}")
             success = self.cancel_follow_request(username)
             
             if success:
                 success_count += 1
             else:
                 failed_usernames.append(username)
+            progress.update(success)
+            logger.info(progress.status_line(), extra={"status": True})
             
             # Save progress after each request
-            self.save_progress(i + 1, success_count, failed_usernames)
+            self.save_progress(i + 1, previous_success + success_count, previous_failed + failed_usernames)
+            
+            if self.trace_file:
+                self.record_trace(username)
+            if self.network:
+                self.record_network_usage(username)
             
             # Check if we need to take a break between batches
-            if (i + 1) % batch_size == 0 and i + 1 < total:
-                batch_delay = random.uniform(20, 30)
-                print(f"\nCompleted batch of {batch_size}. Taking a {batch_delay:.1f} second break...")
-                time.sleep(batch_delay)
+            if (i + 1) % batch_size == 0 and (total is None or i + 1 < total):
+                batch_delay = random.uniform(self.batch_break_min, self.batch_break_max)
+                logger.info(f"Completed batch of {batch_size}. Taking a {batch_delay:.1f} second break...")
+                self._interruptible_sleep(batch_delay)
+            
+            i += 1
         
         return success_count, failed_usernames
 
+    def record_trace(self, username):
+        """
+        Append the timings of the last processed username to the trace file.
+        
+        Each line is a JSON object with the username, its outcome and the
+        seconds spent in each phase. simulate_run.py reads these files.
+        
+        Args:
+            username (str): Instagram username that was just processed
+        """
+        record = {
+            "username": username,
+            "outcome": self.last_outcome,
+            "nav_mode": self.last_nav_mode,
+            "phases": self.last_phases,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        
+        with open(self.trace_file, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def record_network_usage(self, username):
+        """
+        Append the network usage of the last processed username to the network log.
+        
+        Args:
+            username (str): Instagram username that was just processed
+        """
+        record = {"username": username, "outcome": self.last_outcome, "nav_mode": self.last_nav_mode}
+        record.update(self.network.finish_item())
+        
+        with open(self.network_log_file, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def report_network_stats(self):
+        """Log the network usage of the run, if it was collected."""
+        if self.network:
+            for line in self.network.summary_lines():
+                logger.info(line)
+
     def save_progress(self, position, success_count, failed_usernames):
         """
         Save the current progress to a file.
@@ -632,8 +1604,52 @@ class InstagramCancellationTool:
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        with open("/app/data/instagram_cancellation_progress.json", "w") as f:
-            json.dump(progress, f, indent=4)
+        atomic_write("/app/data/instagram_cancellation_progress.json", json.dumps(progress, indent=4))
+        self.last_progress = progress
+
+    def save_failed_usernames(self, failed_usernames):
+        """
+        Save the usernames that could not be cancelled, one per line.
+        
+        Args:
+            failed_usernames (list): List of usernames that failed
+        """
+        atomic_write("/app/data/failed_cancellations.txt", "".join(f"{username}\n" for username in failed_usernames))
+
+    def save_run_metrics(self):
+        """Save navigation timings and network usage of the run to /app/data/run_metrics.json."""
+        metrics = {
+            "time_to_button": {
+                mode: {
+                    "count": len(samples),
+                    "median": statistics.median(samples),
+                    "mean": round(statistics.mean(samples), 3)
+                }
+                for mode, samples in self.time_to_button.items() if samples
+            },
+            "spa_fallbacks": self.spa_fallbacks,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        if self.network:
+            metrics["network"] = {"totals": self.network.totals, "phases": self.network.phase_totals}
+        
+        atomic_write("/app/data/run_metrics.json", json.dumps(metrics, indent=4))
+
+    def flush_checkpoint(self):
+        """
+        Durably write everything needed to resume with --continue.
+        
+        Progress is already written after every username; this adds the
+        failed usernames, the run metrics and any queued log output.
+        """
+        try:
+            if self.last_progress and self.last_progress["failed_usernames"]:
+                self.save_failed_usernames(self.last_progress["failed_usernames"])
+            if self.run_started:
+                self.save_run_metrics()
+        except Exception as e:
+            logger.error(f"Error saving checkpoint: {str(e)}")
+        flush_logging()
 
     def load_progress(self):
         """
@@ -654,13 +1670,22 @@ class InstagramCancellationTool:
             print(f"Error loading progress: {str(e)}")
             return 0, 0, []
 
-    def close(self):
+    def close(self, timeout=15):
         """
         Close the browser and clean up.
+        
+        Args:
+            timeout (int): Maximum time in seconds to wait for the browser to quit
         """
         if hasattr(self, 'driver'):
-            self.driver.quit()
-            print("Browser closed.")
+            # driver.quit() can hang on a wedged browser, so don't wait on it forever
+            quit_thread = threading.Thread(target=self.driver.quit, daemon=True)
+            quit_thread.start()
+            quit_thread.join(timeout)
+            if quit_thread.is_alive():
+                print(f"Browser did not quit within {timeout} seconds, leaving it behind.")
+            else:
+                print("Browser closed.")
 
 
 def main():
@@ -672,14 +1697,28 @@ def main():
     parser.add_argument('--delay-min', type=int, default=2, help='Minimum delay between requests in seconds')
     parser.add_argument('--delay-max', type=int, default=4, help='Maximum delay between requests in seconds')
     parser.add_argument('--batch-size', type=int, default=10, help='Number of requests to cancel in one batch')
+    parser.add_argument('--profile-timeout', type=int, default=45, help='Maximum time in seconds spent on a single username')
+    parser.add_argument('--page-load-timeout', type=int, default=30, help='Maximum time in seconds for a single page load')
     parser.add_argument('--continue', dest='continue_from_last', action='store_true', help='Continue from last saved position')
     parser.add_argument('--usernames-file', type=str, help='Path to a text file with usernames (one per line)')
+    parser.add_argument('--batch-break-min', type=int, default=20, help='Minimum break between batches in seconds')
+    parser.add_argument('--batch-break-max', type=int, default=30, help='Maximum break between batches in seconds')
+    parser.add_argument('--trace', action='store_true', help='Record per-phase timings to /app/data/run_trace.jsonl')
+    parser.add_argument('--spa-settle-timeout', type=int, default=5, help='Seconds to wait for in-app navigation before falling back to a full page load')
+    parser.add_argument('--network-stats', action='store_true', help='Record requests and bytes per username to /app/data/network_usage.jsonl')
+    parser.add_argument('--spa-navigation', action='store_true', help='Move between profiles without reloading the page (falls back to a full load)')
+    parser.add_argument('--verbose', action='store_true', help='Show every step for each username')
+    parser.add_argument('--live', action='store_true', help="Read usernames from the account's current follow requests page instead of an export")
+    parser.add_argument('--verify', action='store_true', help='Check usernames against the live pending list before and after the run')
+    parser.add_argument('--shutdown-grace', type=int, default=15, help='Maximum time in seconds to wait for the browser to quit on shutdown')
     
     args = parser.parse_args()
     
     # Create the data directory if it doesn't exist
     os.makedirs("/app/data", exist_ok=True)
     
+    setup_logging(verbose=args.verbose)
+    
     # Because we're handling 2FA, we need the browser to be visible during login
     # But we can respect the headless setting for the rest of the process
     is_headless = not args.no_headless
@@ -690,24 +1729,56 @@ def main():
     tool = InstagramCancellationTool(
         headless=False,  # Always show browser for 2FA 
         delay_min=args.delay_min, 
-        delay_max=args.delay_max
+        delay_max=args.delay_max,
+        profile_timeout=args.profile_timeout,
+        page_load_timeout=args.page_load_timeout,
+        batch_break_min=args.batch_break_min,
+        batch_break_max=args.batch_break_max,
+        trace_file="/app/data/run_trace.jsonl" if args.trace else None,
+        spa_navigation=args.spa_navigation,
+        spa_settle_timeout=args.spa_settle_timeout,
+        network_log_file="/app/data/network_usage.jsonl" if args.network_stats else None
     )
     
+    # SIGINT (Ctrl+C) and SIGTERM (docker compose stop) let the current step finish
+    # (a username, a page of the pending list), then stop. A second signal, or any
+    # signal while waiting for input, interrupts immediately.
+    def handle_stop_signal(signum, frame):
+        if tool.stop_requested or tool.at_prompt:
+            tool.request_stop()
+            raise KeyboardInterrupt
+        tool.request_stop()
+    
+    def ignore_stop_signals():
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    
+    signal.signal(signal.SIGINT, handle_stop_signal)
+    signal.signal(signal.SIGTERM, handle_stop_signal)
+    
     try:
         # Login to Instagram
         if not args.username or not args.password:
-            args.username = input("Enter your Instagram username: ")
-            args.password = input("Enter your Instagram password: ")
+            args.username = tool.ask("Enter your Instagram username: ")
+            args.password = tool.ask("Enter your Instagram password: ")
         
         if not tool.login(args.username, args.password):
             print("Failed to log in. Exiting.")
             tool.close()
             return
         
+        if tool.stop_requested:
+            print("Stop requested. Exiting.")
+            return
+        
         # Get usernames
         usernames = []
         
-        if args.html:
+        if args.live:
+            # Read the current pending list straight from Instagram in a second tab,
+            # cancelling each batch while the next one loads
+            usernames = tool.stream_pending_usernames_in_tab(LIVE_BEFORE_FILE)
+        elif args.html:
             # Extract usernames from HTML file
             usernames = tool.extract_usernames_from_html(args.html)
         elif args.usernames_file:
@@ -724,7 +1795,7 @@ def main():
                 usernames = tool.extract_usernames_from_html(html_path)
             else:
                 # Ask for HTML file path
-                html_path = input("Enter the path to your pending_follow_requests.html file (in /app/data/): ")
+                html_path = tool.ask("Enter the path to your pending_follow_requests.html file (in /app/data/): ")
                 full_path = f"/app/data/{html_path}"
                 if os.path.exists(full_path):
                     usernames = tool.extract_usernames_from_html(full_path)
@@ -733,14 +1804,35 @@ def main():
                     tool.close()
                     return
         
-        if not usernames:
+        if args.verify and not args.live:
+            # Drop usernames that are no longer pending so no page loads are wasted on them
+            try:
+                live_set = set(tool.fetch_pending_requests(LIVE_BEFORE_FILE))
+            except PendingListUnavailableError as e:
+                # An unreadable list is not an empty one: keep every username
+                logger.warning(f"Could not read the live pending list ({str(e)}); not filtering usernames.")
+                live_set = None
+            if live_set is not None:
+                stale = [u for u in usernames if u not in live_set]
+                usernames = [u for u in usernames if u in live_set]
+                logger.info(f"Skipping {len(stale)} usernames that are no longer pending.")
+            
+            if tool.stop_requested:
+                logger.info("Stop requested. Exiting.")
+                return
+        
+        if not args.live and not usernames:
             print("No usernames found. Exiting.")
             tool.close()
             return
         
         # Ask for confirmation
-        print(f"\nFound {len(usernames)} pending follow requests.")
-        confirm = input(f"Do you want to cancel them all? (y/n): ")
+        flush_logging()
+        if args.live:
+            confirm = tool.ask("Do you want to cancel every request on the live pending list as it loads? (y/n): ")
+        else:
+            print(f"\nFound {len(usernames)} pending follow requests.")
+            confirm = tool.ask(f"Do you want to cancel them all? (y/n): ")
         
         if confirm.lower() != 'y':
             print("Operation cancelled by user.")
@@ -752,52 +1844,100 @@ def main():
         success_count = 0
         failed_usernames = []
         
-        if args.continue_from_last:
+        if args.continue_from_last and (args.live or args.verify):
+            # The live list only contains requests that are still pending, so there is nothing to skip
+            print("Live pending list already excludes processed usernames; ignoring saved position.")
+        elif args.continue_from_last:
             start_position, success_count, failed_usernames = tool.load_progress()
             print(f"Continuing from position {start_position} with {success_count} previously successful cancellations.")
             
-            # Remove already processed usernames
-            usernames = usernames[start_position:]
-            
-            if not usernames:
+            if start_position >= len(usernames):
                 print("All usernames have been processed already.")
                 tool.close()
                 return
         
         # Cancel the follow requests
-        print(f"\nCancelling {len(usernames)} follow requests (batch size: {args.batch_size})...")
+        if args.live:
+            logger.info(f"Cancelling follow requests from the live list (batch size: {args.batch_size})...")
+        else:
+            logger.info(f"Cancelling {len(usernames) - start_position} follow requests (batch size: {args.batch_size})...")
         new_success_count, new_failed_usernames = tool.cancel_all_requests(
             usernames, 
             batch_size=args.batch_size,
-            continue_from=0  # We've already adjusted the list
+            continue_from=start_position,
+            previous_success=success_count,
+            previous_failed=failed_usernames
         )
         
+        if args.live:
+            # Close the list tab and keep what was actually read from it
+            usernames.close()
+            usernames = list(tool.live_usernames)
+        
         total_success = success_count + new_success_count
         total_failed = failed_usernames + new_failed_usernames
         
-        print(f"\nCancellation process completed.")
-        print(f"Successfully cancelled: {total_success}")
-        print(f"Failed to cancel: {len(total_failed)}")
+        if tool.stop_requested:
+            logger.info("Stopped early. Run with --continue to resume from the saved position.")
+        elif args.verify:
+            # Confirm against the live list: a click that didn't throw is not proof of cancellation
+            logger.info("Verifying cancellations against the live pending list...")
+            try:
+                live_after = set(tool.fetch_pending_requests(LIVE_AFTER_FILE))
+            except PendingListUnavailableError as e:
+                live_after = None
+                # An unreadable list would make every reported cancellation look verified
+                logger.warning(f"Could not read the live pending list ({str(e)}); verification skipped.")
+            if live_after is not None and tool.stop_requested:
+                # A partial list would make cancelled requests look verified
+                logger.info("Stop requested, verification skipped.")
+            elif live_after is not None:
+                failed_set = set(new_failed_usernames)
+                still_pending = [u for u in usernames[start_position:] if u in live_after and u not in failed_set]
+                verified = new_success_count - len(still_pending)
+                logger.info(f"Verified cancellations: {verified} of {new_success_count} reported")
+                total_success -= len(still_pending)
+                total_failed = total_failed + still_pending
+        
+        logger.info("Cancellation process completed.")
+        logger.info(f"Successfully cancelled: {total_success}")
+        logger.info(f"Failed to cancel: {len(total_failed)}")
+        tool.report_navigation_stats()
+        tool.report_network_stats()
         
         if total_failed:
-            print("\nFailed usernames:")
+            logger.info("Failed usernames:")
             for username in total_failed:
-                print(f"- {username}")
+                logger.info(f"- {username}")
             
             # Save failed usernames to a file
-            with open("/app/data/failed_cancellations.txt", "w") as f:
-                for username in total_failed:
-                    f.write(f"{username}\n")
-            print("Failed usernames saved to /app/data/failed_cancellations.txt")
+            tool.save_failed_usernames(total_failed)
+            logger.info("Failed usernames saved to /app/data/failed_cancellations.txt")
+        
+        tool.save_run_metrics()
         
     except KeyboardInterrupt:
-        print("\nOperation cancelled by user. Saving progress...")
-    except KeyboardInterrupt:
-        print("\nOperation cancelled by user. Saving progress...")
+        # Don't let another signal interrupt saving the failed list and metrics
+        ignore_stop_signals()
+        logger.warning("Operation cancelled by user. Saving progress...")
+        tool.flush_checkpoint()
     except Exception as e:
-        print(f"An error occurred: {str(e)}")
+        ignore_stop_signals()
+        logger.error(f"An error occurred: {str(e)}")
+        tool.flush_checkpoint()
     finally:
-        tool.close()
+        # Don't let another signal interrupt the cleanup
+        ignore_stop_signals()
+        logging_finished = True
+        try:
+            logging_finished = shutdown_logging()
+        finally:
+            tool.close(timeout=args.shutdown_grace)
+        if not logging_finished:
+            # The stuck writer holds the stdout lock, which interpreter shutdown would wait on;
+            # progress and metrics are already on disk, so skip the rest of the teardown
+            sys.stderr.flush()
+            os._exit(0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+import json
+import random
+import argparse
+import itertools
+import statistics
+
+# Outcomes that may succeed when the username is rerun from the failed list; the others are
+# permanent (the profile is gone or the request no longer exists).
+TRANSIENT_OUTCOMES = {"timeout", "page_load_timeout", "error"}
+
+
+class PhaseModel:
+    def __init__(self, records):
+        """
+        Build empirical latency distributions from recorded run traces.
+
+        Args:
+            records (list): Trace records written by InstagramCancellationTool.record_trace
+        """
+        self.success_work = []
+        self.failure_work = {}
+        self.outcome_counts = {}
+
+        for record in records:
+            outcome = record.get("outcome") or "error"
+            phases = record.get("phases", {})
+            # The pacing delay is a tuning parameter, so it is simulated rather than replayed
+            work = sum(seconds for phase, seconds in phases.items() if phase != "pace")
+
+            self.outcome_counts[outcome] = self.outcome_counts.get(outcome, 0) + 1
+            if outcome == "success":
+                self.success_work.append(work)
+            else:
+                self.failure_work.setdefault(outcome, []).append(work)
+
+        self.total = sum(self.outcome_counts.values())
+        if not self.total:
+            raise ValueError("Traces contain no usernames to model")
+        if not self.success_work:
+            raise ValueError("Traces contain no successful cancellations to model")
+
+    def outcome_probability(self, outcome):
+        """Share of recorded usernames that ended with `outcome`."""
+        return self.outcome_counts.get(outcome, 0) / self.total
+
+    def sample(self, rng, previous_outcome=None):
+        """
+        Draw the outcome and working time (excluding pacing) of one username.
+
+        Args:
+            rng (random.Random): Random number generator
+            previous_outcome (str): Outcome of the previous attempt when the username is
+                                    rerun from the failed list, None on the first attempt
+
+        Returns:
+            tuple: (outcome, seconds)
+        """
+        # A permanent failure (profile gone, no Requested button) fails the same way again
+        if previous_outcome is not None and previous_outcome not in TRANSIENT_OUTCOMES:
+            return previous_outcome, rng.choice(self.failure_work[previous_outcome])
+
+        roll = rng.random()
+        cumulative = 0.0
+        for outcome, samples in self.failure_work.items():
+            # A rerun username is one that failed transiently, so it can't turn out missing now
+            if previous_outcome is not None and outcome not in TRANSIENT_OUTCOMES:
+                continue
+            cumulative += self.outcome_probability(outcome)
+            if roll < cumulative:
+                return outcome, rng.choice(samples)
+        return "success", rng.choice(self.success_work)
+
+
+# Trace nav_mode values recorded by runs with and without --spa-navigation
+NAV_MODES = {
+    "spa": {"spa", "fallback"},
+    "full": {"full"}
+}
+
+
+def load_traces(paths, nav_mode=None):
+    """
+    Read trace records from one or more JSONL files.
+
+    Args:
+        paths (list): Paths to run_trace.jsonl files
+        nav_mode (str): Only keep usernames recorded with this navigation mode ("spa" or "full")
+
+    Returns:
+        list: Trace records
+    """
+    records = []
+    for path in paths:
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    if nav_mode:
+        records = [record for record in records if record.get("nav_mode") in NAV_MODES[nav_mode]]
+    return records
+
+
+def simulate_pass(model, outcomes, settings, rng, clock):
+    """
+    Replay the cancel_all_requests loop over one list of usernames.
+
+    Args:
+        model (PhaseModel): Latency and failure model
+        outcomes (list): Previous outcome of each username, None for first attempts
+        settings (dict): delay_min, delay_max, batch_size, break_min, break_max
+        rng (random.Random): Random number generator
+        clock (float): Simulated time at the start of the pass
+
+    Returns:
+        tuple: (clock, success_count, failed_outcomes)
+    """
+    success_count = 0
+    failed_outcomes = []
+    count = len(outcomes)
+
+    for i, previous_outcome in enumerate(outcomes):
+        outcome, work = model.sample(rng, previous_outcome)
+        clock += work
+
+        if outcome == "success":
+            success_count += 1
+            # The pacing delay only follows a successful cancellation
+            clock += rng.uniform(settings["delay_min"], settings["delay_max"])
+        else:
+            failed_outcomes.append(outcome)
+
+        if (i + 1) % settings["batch_size"] == 0 and i + 1 < count:
+            clock += rng.uniform(settings["break_min"], settings["break_max"])
+
+    return clock, success_count, failed_outcomes
+
+
+def simulate_run(model, usernames, settings, rng, reruns=0):
+    """
+    Simulate one full run, then `reruns` runs over failed_cancellations.txt.
+
+    The tool itself never retries; a rerun is a new invocation with
+    --usernames-file pointing at the failed list, which contains every
+    failed username, including ones that will fail again.
+
+    Returns:
+        tuple: (total_seconds, success_count)
+    """
+    clock, success_count, failed = simulate_pass(model, [None] * usernames, settings, rng, 0.0)
+
+    for _ in range(reruns):
+        if not failed:
+            break
+        clock, rerun_success, failed = simulate_pass(model, failed, settings, rng, clock)
+        success_count += rerun_success
+
+    return clock, success_count
+
+
+def evaluate(model, usernames, settings, runs, reruns, seed):
+    """
+    Run the simulation repeatedly for one parameter set.
+
+    Returns:
+        dict: Mean and 90th percentile wall-clock time and mean throughput
+    """
+    rng = random.Random(seed)
+    durations = []
+    successes = []
+    for _ in range(runs):
+        seconds, success_count = simulate_run(model, usernames, settings, rng, reruns)
+        durations.append(seconds)
+        successes.append(success_count)
+
+    durations.sort()
+    mean_seconds = statistics.mean(durations)
+    return {
+        "mean_seconds": mean_seconds,
+        "p90_seconds": durations[int(0.9 * (len(durations) - 1))],
+        "per_minute": statistics.mean(successes) / (mean_seconds / 60) if mean_seconds else 0.0
+    }
+
+
+def parse_values(text, cast):
+    """Parse a comma-separated list of numbers, e.g. '2,3,4'."""
+    return [cast(value) for value in text.split(",") if value.strip()]
+
+
+def format_duration(seconds):
+    """Format seconds as H:MM:SS."""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Predict run time of the Instagram cancellation tool from recorded traces')
+    parser.add_argument('--trace', type=str, nargs='+', default=['/app/data/run_trace.jsonl'], help='Trace files recorded with --trace')
+    parser.add_argument('--usernames', type=int, default=500, help='Number of usernames to simulate')
+    parser.add_argument('--delay-min', type=str, default='2', help='Minimum delay values to try, comma separated')
+    parser.add_argument('--delay-max', type=str, default='4', help='Maximum delay values to try, comma separated')
+    parser.add_argument('--batch-size', type=str, default='10', help='Batch sizes to try, comma separated')
+    parser.add_argument('--batch-break-min', type=str, default='20', help='Minimum batch break values to try, comma separated')
+    parser.add_argument('--batch-break-max', type=str, default='30', help='Maximum batch break values to try, comma separated')
+    parser.add_argument('--reruns', type=int, default=0,
+                        help='Number of follow-up runs with --usernames-file failed_cancellations.txt (the tool never retries on its own)')
+    parser.add_argument('--nav-mode', choices=sorted(NAV_MODES), help='Only use traces recorded with this navigation mode')
+    parser.add_argument('--runs', type=int, default=200, help='Simulated runs per parameter set')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    args = parser.parse_args()
+
+    try:
+        model = PhaseModel(load_traces(args.trace, args.nav_mode))
+    except OSError as e:
+        print(f"Could not read trace file: {e}")
+        return
+    except ValueError as e:
+        # Covers malformed lines as well as traces with nothing to model
+        mode = f" (navigation mode: {args.nav_mode})" if args.nav_mode else ""
+        print(f"Cannot build a model from {', '.join(args.trace)}{mode}: {e}")
+        return
+    print(f"Loaded {model.total} traced usernames.")
+    for outcome, count in sorted(model.outcome_counts.items()):
+        print(f"  {outcome}: {count} ({count / model.total:.1%})")
+
+    grid = itertools.product(
+        parse_values(args.delay_min, float),
+        parse_values(args.delay_max, float),
+        parse_values(args.batch_size, int),
+        parse_values(args.batch_break_min, float),
+        parse_values(args.batch_break_max, float)
+    )
+
+    results = []
+    for delay_min, delay_max, batch_size, break_min, break_max in grid:
+        if delay_min > delay_max or break_min > break_max or batch_size < 1:
+            continue
+        settings = {
+            "delay_min": delay_min,
+            "delay_max": delay_max,
+            "batch_size": batch_size,
+            "break_min": break_min,
+            "break_max": break_max
+        }
+        results.append((settings, evaluate(model, args.usernames, settings, args.runs, args.reruns, args.seed)))
+
+    if not results:
+        print("No valid parameter combinations to simulate.")
+        return
+
+    results.sort(key=lambda item: item[1]["mean_seconds"])
+
+    print(f"\nSimulated {args.usernames} usernames, {args.runs} runs per setting:")
+    print(f"{'delay':>11} {'batch':>6} {'break':>11} {'mean':>9} {'p90':>9} {'per min':>8}")
+    for settings, result in results:
+        delay = f"{settings['delay_min']:g}-{settings['delay_max']:g}"
+        batch_break = f"{settings['break_min']:g}-{settings['break_max']:g}"
+        print(f"{delay:>11} {settings['batch_size']:>6} {batch_break:>11} "
+              f"{format_duration(result['mean_seconds']):>9} {format_duration(result['p90_seconds']):>9} "
+              f"{result['per_minute']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()